@@ -25,7 +25,7 @@ from langchain_core.messages import (
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from deep_research_from_scratch.prompts import lead_researcher_prompt
+from deep_research_from_scratch.prompts import render_lead_researcher
 from deep_research_from_scratch.research_agent import researcher_agent
 from deep_research_from_scratch.state_multi_agent_supervisor import (
     SupervisorState, 
@@ -99,7 +99,7 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
     supervisor_messages = state.get("supervisor_messages", [])
 
     # Prepare system message with current date and constraints
-    system_message = lead_researcher_prompt.format(
+    system_message = render_lead_researcher(
         date=get_today_str(), 
         max_concurrent_research_units=max_concurrent_researchers,
         max_researcher_iterations=max_researcher_iterations
@@ -2,16 +2,186 @@
 
 This module contains all prompt templates used across the research workflow components,
 including user clarification, research brief generation, and report synthesis.
+
+Each template is kept as a plain string for readability, and is paired with a
+``render_*`` ``PromptTemplate`` (see the bottom of this module) compiled once, on
+first use, so call sites don't re-parse the format string on every request.
+
+Dynamic fields (dates, messages, limits, findings) are kept at the end of each
+template so the static instructions form a stable prefix that LLM providers
+can serve from their prompt cache.
 """
 
-clarify_with_user_instructions="""
-These are the messages that have been exchanged so far from the user asking for the report:
-<Messages>
-{messages}
-</Messages>
+import functools
+import keyword
+import linecache
+import re
+import string
+from importlib import resources
+from typing import Callable, Mapping
+
+# ===== TEMPLATE COMPILATION =====
+
+@functools.cache
+def _load_prompt_data(filename: str) -> str:
+    """Read a static prompt fragment shipped in the ``prompts_data`` directory."""
+    path = resources.files(__package__).joinpath("prompts_data", filename)
+    return path.read_text(encoding="utf-8").rstrip("\n")
+
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+def _normalize(template: str) -> str:
+    """Strip whitespace that costs tokens without carrying meaning.
+
+    Removes trailing spaces on each line, collapses runs of blank lines to a
+    single blank line, and trims leading and trailing newlines.
+    """
+    template = _TRAILING_SPACE_RE.sub("", template)
+    return _BLANK_RUN_RE.sub("\n\n", template).strip("\n")
+
+def _compile(template: str, name: str = "render", bound: Mapping[str, str] | None = None) -> tuple[Callable[..., str], tuple[str, ...]]:
+    """Compile a ``str.format`` template into an equivalent f-string function.
+
+    The template is parsed once, and a function whose body is a single f-string
+    over the literal segments and field names is generated with ``compile``.
+    Rendering then runs as one ``BUILD_STRING`` instead of going through the
+    ``str.format`` parser on every call.
+
+    Args:
+        template: Template string using named ``{field}`` placeholders
+        name: Name given to the generated function
+        bound: Field values fixed at compile time; they are inlined as literal
+            text and are not parameters of the generated function
+
+    Returns:
+        Function taking the template fields as keyword arguments, equivalent
+        to ``template.format(**kwargs)``, and the names of those fields
+    """
+    namespace: dict[str, object] = {}
+    pieces: list[str] = []
+    fields: list[str] = []
+    pending = ""
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        # Escaped braces ("{{" / "}}") surface as extra literal-only parts; merge them
+        pending += literal
+        if field is None:
+            continue
+        if not field.isidentifier() or keyword.iskeyword(field) or spec or conversion:
+            raise ValueError(f"Unsupported placeholder in prompt template: {{{field}}}")
+        if bound and field in bound:
+            pending += bound[field]
+            continue
+        # Literals are referenced by name so they never need quoting inside the f-string
+        if pending:
+            namespace[f"_l{len(namespace)}"] = pending
+            pieces.append(f"{{_l{len(namespace) - 1}}}")
+        pieces.append(f"{{{field}}}")
+        if field not in fields:
+            fields.append(field)
+        pending = ""
+    if pending:
+        namespace[f"_l{len(namespace)}"] = pending
+        pieces.append(f"{{_l{len(namespace) - 1}}}")
+
+    params = f"*, {', '.join(fields)}" if fields else ""
+    source = f"def {name}({params}) -> str:\n    return f'{''.join(pieces)}'\n"
+    filename = f"<prompts:{name}>"
+    # Register the generated source so tracebacks and inspect.getsource can show it
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace[name], tuple(fields)
+
+class PromptTemplate:
+    """A named prompt template compiled once into a fast renderer.
+
+    Calling the template with its fields as keyword arguments returns the
+    rendered prompt. Missing or unknown fields raise a ``TypeError`` naming
+    the template and the offending fields.
+    """
+
+    __slots__ = ("name", "fields", "_render")
+
+    def __init__(self, name: str, template: str, bound: Mapping[str, str] | None = None, cache: bool = False):
+        """Compile ``template``.
+
+        Args:
+            name: Name of the template, used in error messages and tracebacks
+            template: Template string using named ``{field}`` placeholders
+            bound: Field values fixed at compile time
+            cache: Whether to memoize rendered prompts by their arguments
+        """
+        render, fields = _compile(_normalize(template), name, bound)
+        self.name = name
+        self.fields = fields
+        self._render = functools.lru_cache(maxsize=64)(render) if cache else render
+
+    def __call__(self, **kwargs: object) -> str:
+        """Render the template with the given field values."""
+        try:
+            return self._render(**kwargs)
+        except TypeError:
+            missing = [field for field in self.fields if field not in kwargs]
+            unexpected = [field for field in kwargs if field not in self.fields]
+            problems = []
+            if missing:
+                problems.append(f"missing fields: {', '.join(missing)}")
+            if unexpected:
+                problems.append(f"unexpected fields: {', '.join(unexpected)}")
+            if not problems:
+                raise
+            raise TypeError(f"Prompt template {self.name!r}: {'; '.join(problems)}") from None
+
+    def __repr__(self) -> str:
+        """Show the template name and its fields."""
+        return f"PromptTemplate({self.name!r}, fields={self.fields!r})"
+
+# ===== SHARED PROMPT BLOCKS =====
+
+_DATE_LINE = "For context, today's date is {date}."
+
+_CITATION_RULES = """- Assign each unique URL a single citation number in your text
+- End with ### Sources that lists each source with corresponding numbers
+- IMPORTANT: Number sources sequentially without gaps (1,2,3,4...) in the final list regardless of which sources you choose"""
 
-Today's date is {date}.
+_CITATION_EXAMPLE = """- Example format:
+  [1] Source Title: URL
+  [2] Source Title: URL"""
+
+_ASSESS_FINDINGS = """- What key information did I find?
+- What's missing?
+- Do I have enough to answer the question comprehensively?"""
+
+def _researcher_prompt(intro: str, task: str, tools: str, instructions: str, hard_limits: str, thinking: str) -> str:
+    """Lay out a researcher system prompt in the section order shared by all researchers."""
+    return f"""{intro}
+
+<Task>
+{task}
+</Task>
+
+<Available Tools>
+{tools}
+</Available Tools>
+
+<Instructions>
+{instructions}
+</Instructions>
 
+<Hard Limits>
+{hard_limits}
+</Hard Limits>
+
+<Show Your Thinking>
+{thinking}
+</Show Your Thinking>
+
+{_DATE_LINE}
+"""
+
+# ===== PROMPT TEMPLATES =====
+
+clarify_with_user_instructions="""
 Assess whether you need to ask a clarifying question, or if the user has already provided enough information for you to start research.
 IMPORTANT: If you can see in the messages history that you have already asked a clarifying question, you almost always do not need to ask another one. Only ask another question if ABSOLUTELY NECESSARY.
 
@@ -42,9 +212,17 @@ For the verification message when no clarification is needed:
 - Briefly summarize the key aspects of what you understand from their request
 - Confirm that you will now begin the research process
 - Keep the message concise and professional
+
+These are the messages that have been exchanged so far from the user asking for the report:
+<Messages>
+{messages}
+</Messages>
+
+Today's date is {date}.
 """
 
-transform_messages_into_research_topic_prompt = """
+# Exported as transform_messages_into_research_topic_prompt with {example} filled in
+_transform_messages_into_research_topic_template = """
 <role>
 You are an expert research strategist who transforms conversations into comprehensive, actionable research briefs that demonstrate deep understanding of user intent and strategic planning.
 </role>
@@ -53,11 +231,6 @@ You are an expert research strategist who transforms conversations into comprehe
 Generate a strategic research brief from the conversation that interprets underlying needs, frames concrete objectives, identifies constraints, specifies deliverables, and acknowledges uncertainties.
 </task>
 
-<inputs>
-<messages>{messages}</messages>
-<current_date>{date}</current_date>
-</inputs>
-
 <guidelines>
 Your research brief must demonstrate these strategic dimensions:
 1. **Intent Understanding**: What is the user trying to accomplish? What decision will they make?
@@ -79,44 +252,23 @@ Your research brief must demonstrate these strategic dimensions:
 </guidelines>
 
 <example>
-<conversation>
-User: "How is IBM watsonx Orchestrate built? What technologies does it use – exactly what APIs, is it using LangGraph? Langfuse? Langflow?"
-Assistant: "To provide an accurate and detailed answer, could you clarify a few things: Are you asking about the overall architecture of watsonx Orchestrate as a product, or its underlying orchestration and agent runtime layer? Do you want a breakdown of specific frameworks and APIs used internally (e.g., LangGraph, LangChain, or proprietary IBM tools)? Should I focus on public technical documentation or internal IBM developer architecture details? This will help me tailor the explanation to the level of depth you want."
-User: "I'm interested in the underlying architecture — specifically how the orchestration and agent runtime works. I want to know which frameworks it integrates with and whether LangGraph, Langfuse, or Langflow are actually part of it."
-</conversation>
-
-<output_example>
-I'm investigating the underlying architecture of IBM watsonx Orchestrate, specifically the orchestration and agent runtime layer—not marketing overviews of what the product does. I need implementation-level detail: which frameworks are integrated, what APIs are exposed to developers, and definitive answers on whether LangGraph, Langfuse, or Langflow are part of the system.
-
-This is technical due diligence, likely for an integration decision or competitive analysis. The word "exactly" in my question signals that I have low tolerance for vague or marketing language. I'm familiar enough with the LLM orchestration ecosystem to ask about specific frameworks, so the research should match that technical depth—assume I can read API documentation and architectural diagrams.
-
-What I need to understand is: How does IBM actually implement the orchestration logic? Is it proprietary, or are they using/integrating open-source frameworks? For the three frameworks I mentioned specifically, I need yes/no answers with evidence, not "it's possible" or "similar to." I also recognize that some internal implementation details may be proprietary and not publicly documented—that's fine, but the research should explicitly acknowledge where the public documentation ends.
-
-**Deliver the following:** Definitive integration status for each framework (LangGraph: yes/no with evidence, Langfuse: yes/no with evidence, Langflow: yes/no with evidence). Document the developer-facing APIs and SDKs available for building with watsonx Orchestrate (specific endpoints, protocols, language support). Describe the architectural patterns used in the orchestration layer (supervisor model, routing mechanisms, agent coordination approaches). List any other frameworks or proprietary IBM technologies involved in the runtime. Distinguish clearly between what's confirmed in official IBM documentation versus what's inferred from technical blogs or community sources. Acknowledge gaps where internal implementation details are not public. Prioritize official IBM technical documentation, developer guides, and API references over marketing materials. Include version information and timestamps on all technical claims since this ecosystem evolves rapidly.
-
-### Success Criteria
-- LangGraph integration status confirmed: yes or no with specific evidence from official sources
-- Langfuse integration status confirmed: yes or no with specific evidence from official sources
-- Langflow integration status confirmed: yes or no with specific evidence from official sources
-- Developer-facing APIs documented: specific endpoints, protocols, authentication methods
-- Orchestration architecture patterns described: how supervisor/routing/coordination works
-- Clear distinction made: official IBM docs vs expert technical blogs vs inferred information
-</output_example>
+{example}
 </example>
 
 <output_format>
 Return a single string containing the complete research brief (300-400 words) with natural paragraphs, a "Deliver the following:" section with imperative instructions, and a "Success Criteria" section with 4-6 bullet points defining research completion.
 </output_format>
-"""
-
-research_agent_prompt = """You are an expert research assistant conducting strategic research based on the user's research brief and success criteria. Your goal is to deliver findings that directly address the brief's objectives. For context, today's date is {date}.
 
-<Task>
-Use the available tools to gather authoritative information that fulfills the research brief's requirements. You will conduct research through a tool-calling loop, making strategic decisions about which tools to use and when. Your thinking process is as important as your findings—the user needs to see how you evaluate sources, build confidence, and make research decisions.
-</Task>
+<inputs>
+<messages>{messages}</messages>
+<current_date>{date}</current_date>
+</inputs>
+"""
 
-<Available Tools>  
-You have access to four main tools:
+research_agent_prompt = _researcher_prompt(
+    intro="""You are an expert research assistant conducting strategic research based on the user's research brief and success criteria. Your goal is to deliver findings that directly address the brief's objectives.""",
+    task="""Use the available tools to gather authoritative information that fulfills the research brief's requirements. You will conduct research through a tool-calling loop, making strategic decisions about which tools to use and when. Your thinking process is as important as your findings—the user needs to see how you evaluate sources, build confidence, and make research decisions.""",
+    tools="""You have access to four main tools:
 
 1. **tavily_search**: Broad web searches to identify relevant sources and promising URLs. Use this for initial exploration and when you need different perspectives.
 
@@ -128,11 +280,8 @@ You have access to four main tools:
 
 **Research Progression**: Start broad (search) → explore promising domains (map) → extract targeted content (extract) → reflect and decide (think). Adapt this flow based on what you discover.
 
-**CRITICAL**: Always use `think_tool` after each search, map, or extraction to make your research process transparent and auditable.
-</Available Tools>
-
-<Instructions>
-Conduct research strategically by following this approach:
+**CRITICAL**: Always use `think_tool` after each search, map, or extraction to make your research process transparent and auditable.""",
+    instructions="""Conduct research strategically by following this approach:
 
 1. **Understand the research brief** - What specific questions must be answered? What does the user actually need? Review the success criteria that define completion.
 
@@ -142,11 +291,8 @@ Conduct research strategically by following this approach:
 
 4. **Refine strategically** - Use narrower searches or targeted extractions to fill specific gaps in the research brief.
 
-5. **Know when to stop** - Stop when you can confidently address the research brief's objectives and have satisfied key success criteria, not when you've exhausted your search budget.
-</Instructions>
-
-<Hard Limits>
-**Tool Call Budgets** (Recognize diminishing returns):
+5. **Know when to stop** - Stop when you can confidently address the research brief's objectives and have satisfied key success criteria, not when you've exhausted your search budget.""",
+    hard_limits="""**Tool Call Budgets** (Recognize diminishing returns):
 - **Search**: 3-5 calls depending on complexity
 - **Map**: 2-3 mapping calls per session  
 - **Extract**: Use strategically on most relevant pages
@@ -156,11 +302,8 @@ Conduct research strategically by following this approach:
 - You can address the research brief's core objectives comprehensively
 - You've satisfied the key success criteria with authoritative sources
 - Your last 2 searches/maps returned similar or redundant information
-- You have sufficient high-confidence findings to deliver value
-</Hard Limits>
-
-<Show Your Thinking>
-After each Tavily operation, use `think_tool` to make your research process transparent. Your thinking IS the research—show the user how you evaluate, reason, and decide:
+- You have sufficient high-confidence findings to deliver value""",
+    thinking="""After each Tavily operation, use `think_tool` to make your research process transparent. Your thinking IS the research—show the user how you evaluate, reason, and decide:
 
 **Source Evaluation**: What did I find? Which sources are most authoritative (official docs, primary sources, expert analysis)? What's their recency and credibility? How do they relate to the research brief?
 
@@ -174,17 +317,11 @@ After each Tavily operation, use `think_tool` to make your research process tran
 
 **Progress Check**: Which success criteria have I satisfied? Am I addressing the user's actual intent or just collecting information? Does this move toward the deliverables specified in the research brief?
 
-Think in natural prose with cognitive flow. Mark high-confidence findings, acknowledge uncertainties explicitly, and show your reasoning at decision points. Make the user trust your research by showing how you thought through it.
-</Show Your Thinking>
-"""
+Think in natural prose with cognitive flow. Mark high-confidence findings, acknowledge uncertainties explicitly, and show your reasoning at decision points. Make the user trust your research by showing how you thought through it.""",
+)
 
-summarize_webpage_prompt = """You are tasked with summarizing the raw content of a webpage retrieved from a web search. Your goal is to create a summary that preserves the most important information from the original web page. This summary will be used by a downstream research agent, so it's crucial to maintain the key details without losing essential information.
-
-Here is the raw content of the webpage:
-
-<webpage_content>
-{webpage_content}
-</webpage_content>
+# Exported as summarize_webpage_prompt with {output_format} filled in
+_summarize_webpage_template = """You are tasked with summarizing the raw content of a webpage retrieved from a web search. Your goal is to create a summary that preserves the most important information from the original web page. This summary will be used by a downstream research agent, so it's crucial to maintain the key details without losing essential information.
 
 Please follow these guidelines to create your summary:
 
@@ -205,48 +342,29 @@ When handling different types of content:
 
 Your summary should be significantly shorter than the original content but comprehensive enough to stand alone as a source of information. Aim for about 25-30 percent of the original length, unless the content is already concise.
 
-Present your summary in the following format:
+Present your summary in the following format, with "key_excerpts" holding up to 5 important quotes or excerpts:
 
-```
-{{
-   "summary": "Your summary here, structured with appropriate paragraphs or bullet points as needed",
-   "key_excerpts": "First important quote or excerpt, Second important quote or excerpt, Third important quote or excerpt, ...Add more excerpts as needed, up to a maximum of 5"
-}}
-```
-
-Here are two examples of good summaries:
-
-Example 1 (for a news article):
-```json
-{{
-   "summary": "On July 15, 2023, NASA successfully launched the Artemis II mission from Kennedy Space Center. This marks the first crewed mission to the Moon since Apollo 17 in 1972. The four-person crew, led by Commander Jane Smith, will orbit the Moon for 10 days before returning to Earth. This mission is a crucial step in NASA's plans to establish a permanent human presence on the Moon by 2030.",
-   "key_excerpts": "Artemis II represents a new era in space exploration, said NASA Administrator John Doe. The mission will test critical systems for future long-duration stays on the Moon, explained Lead Engineer Sarah Johnson. We're not just going back to the Moon, we're going forward to the Moon, Commander Jane Smith stated during the pre-launch press conference."
-}}
-```
-
-Example 2 (for a scientific article):
 ```json
-{{
-   "summary": "A new study published in Nature Climate Change reveals that global sea levels are rising faster than previously thought. Researchers analyzed satellite data from 1993 to 2022 and found that the rate of sea-level rise has accelerated by 0.08 mm/year² over the past three decades. This acceleration is primarily attributed to melting ice sheets in Greenland and Antarctica. The study projects that if current trends continue, global sea levels could rise by up to 2 meters by 2100, posing significant risks to coastal communities worldwide.",
-   "key_excerpts": "Our findings indicate a clear acceleration in sea-level rise, which has significant implications for coastal planning and adaptation strategies, lead author Dr. Emily Brown stated. The rate of ice sheet melt in Greenland and Antarctica has tripled since the 1990s, the study reports. Without immediate and substantial reductions in greenhouse gas emissions, we are looking at potentially catastrophic sea-level rise by the end of this century, warned co-author Professor Michael Green."  
-}}
+{output_format}
 ```
 
 Remember, your goal is to create a summary that can be easily understood and utilized by a downstream research agent while preserving the most critical information from the original webpage.
 
 Today's date is {date}.
-"""
 
-# Research agent prompt for MCP (Model Context Protocol) file access
-research_agent_prompt_with_mcp = """You are a research assistant conducting research on the user's input topic using local files. For context, today's date is {date}.
+Here is the raw content of the webpage:
 
-<Task>
-Your job is to use file system tools to gather information from local research files.
-You can use any of the tools provided to you to find and read files that help answer the research question. You can call these tools in series or in parallel, your research is conducted in a tool-calling loop.
-</Task>
+<webpage_content>
+{webpage_content}
+</webpage_content>
+"""
 
-<Available Tools>
-You have access to file system tools and thinking tools:
+# Research agent prompt for MCP (Model Context Protocol) file access
+research_agent_prompt_with_mcp = _researcher_prompt(
+    intro="""You are a research assistant conducting research on the user's input topic using local files.""",
+    task="""Your job is to use file system tools to gather information from local research files.
+You can use any of the tools provided to you to find and read files that help answer the research question. You can call these tools in series or in parallel, your research is conducted in a tool-calling loop.""",
+    tools="""You have access to file system tools and thinking tools:
 - **list_allowed_directories**: See what directories you can access
 - **list_directory**: List files in directories
 - **read_file**: Read individual files
@@ -254,22 +372,16 @@ You have access to file system tools and thinking tools:
 - **search_files**: Find files containing specific content
 - **think_tool**: For reflection and strategic planning during research
 
-**CRITICAL: Use think_tool after reading files to reflect on findings and plan next steps**
-</Available Tools>
-
-<Instructions>
-Think like a human researcher with access to a document library. Follow these steps:
+**CRITICAL: Use think_tool after reading files to reflect on findings and plan next steps**""",
+    instructions="""Think like a human researcher with access to a document library. Follow these steps:
 
 1. **Read the question carefully** - What specific information does the user need?
 2. **Explore available files** - Use list_allowed_directories and list_directory to understand what's available
 3. **Identify relevant files** - Use search_files if needed to find documents matching the topic
 4. **Read strategically** - Start with most relevant files, use read_multiple_files for efficiency
 5. **After reading, pause and assess** - Do I have enough to answer? What's still missing?
-6. **Stop when you can answer confidently** - Don't keep reading for perfection
-</Instructions>
-
-<Hard Limits>
-**File Operation Budgets** (Prevent excessive file reading):
+6. **Stop when you can answer confidently** - Don't keep reading for perfection""",
+    hard_limits="""**File Operation Budgets** (Prevent excessive file reading):
 - **Simple queries**: Use 3-4 file operations maximum
 - **Complex queries**: Use up to 6 file operations maximum
 - **Always stop**: After 6 file operations if you cannot find the right information
@@ -277,19 +389,14 @@ Think like a human researcher with access to a document library. Follow these st
 **Stop Immediately When**:
 - You can answer the user's question comprehensively from the files
 - You have comprehensive information from 3+ relevant files
-- Your last 2 file reads contained similar information
-</Hard Limits>
-
-<Show Your Thinking>
-After reading files, use think_tool to analyze what you found:
-- What key information did I find?
-- What's missing?
-- Do I have enough to answer the question comprehensively?
+- Your last 2 file reads contained similar information""",
+    thinking="""After reading files, use think_tool to analyze what you found:
+""" + _ASSESS_FINDINGS + """
 - Should I read more files or provide my answer?
-- Always cite which files you used for your information
-</Show Your Thinking>"""
+- Always cite which files you used for your information""",
+)
 
-lead_researcher_prompt = """You are a research supervisor. Your job is to conduct research by calling the "ConductResearch" tool. For context, today's date is {date}.
+lead_researcher_prompt = """You are a research supervisor. Your job is to conduct research by calling the "ConductResearch" tool.
 
 <Task>
 Your focus is to call the "ConductResearch" tool to conduct research against the overall research question passed in by the user. 
@@ -303,7 +410,7 @@ You have access to three main tools:
 3. **think_tool**: For reflection and strategic planning during research
 
 **CRITICAL: Use think_tool before calling ConductResearch to plan your approach, and after each ConductResearch to assess progress**
-**PARALLEL RESEARCH**: When you identify multiple independent sub-topics that can be explored simultaneously, make multiple ConductResearch tool calls in a single response to enable parallel research execution. This is more efficient than sequential research for comparative or multi-faceted questions. Use at most {max_concurrent_research_units} parallel agents per iteration.
+**PARALLEL RESEARCH**: When you identify multiple independent sub-topics that can be explored simultaneously, make multiple ConductResearch tool calls in a single response to enable parallel research execution. This is more efficient than sequential research for comparative or multi-faceted questions. Use at most the number of parallel agents per iteration given in <Research Limits> below.
 </Available Tools>
 
 <Instructions>
@@ -318,7 +425,7 @@ Think like a research manager with limited time and resources. Follow these step
 **Task Delegation Budgets** (Prevent excessive delegation):
 - **Bias towards single agent** - Use single agent for simplicity unless the user request has clear opportunity for parallelization
 - **Stop when you can answer confidently** - Don't keep delegating research for perfection
-- **Limit tool calls** - Always stop after {max_researcher_iterations} tool calls to think_tool and ConductResearch if you cannot find the right sources
+- **Limit tool calls** - Always stop after the number of tool calls to think_tool and ConductResearch given in <Research Limits> below if you cannot find the right sources
 </Hard Limits>
 
 <Show Your Thinking>
@@ -326,9 +433,7 @@ Before you call ConductResearch tool call, use think_tool to plan your approach:
 - Can the task be broken down into smaller sub-tasks?
 
 After each ConductResearch tool call, use think_tool to analyze the results:
-- What key information did I find?
-- What's missing?
-- Do I have enough to answer the question comprehensively?
+""" + _ASSESS_FINDINGS + """
 - Should I delegate more research or call ResearchComplete?
 </Show Your Thinking>
 
@@ -345,9 +450,16 @@ After each ConductResearch tool call, use think_tool to analyze the results:
 - A separate agent will write the final report - you just need to gather information
 - When calling ConductResearch, provide complete standalone instructions - sub-agents can't see other agents' work
 - Do NOT use acronyms or abbreviations in your research questions, be very clear and specific
-</Scaling Rules>"""
+</Scaling Rules>
+
+<Research Limits>
+- Maximum parallel agents per iteration: {max_concurrent_research_units}
+- Maximum tool calls to think_tool and ConductResearch: {max_researcher_iterations}
+</Research Limits>
+
+""" + _DATE_LINE
 
-compress_research_system_prompt = """You are a research assistant that has conducted research on a topic by calling several tools and web searches. Your job is now to clean up the findings, but preserve all of the relevant statements and information that the researcher has gathered. For context, today's date is {date}.
+compress_research_system_prompt = """You are a research assistant that has conducted research on a topic by calling several tools and web searches. Your job is now to clean up the findings, but preserve all of the relevant statements and information that the researcher has gathered.
 
 <Task>
 You need to clean up information gathered from tool calls and web searches in the existing messages.
@@ -383,16 +495,13 @@ The report should be structured like this:
 </Output Format>
 
 <Citation Rules>
-- Assign each unique URL a single citation number in your text
-- End with ### Sources that lists each source with corresponding numbers
-- IMPORTANT: Number sources sequentially without gaps (1,2,3,4...) in the final list regardless of which sources you choose
-- Example format:
-  [1] Source Title: URL
-  [2] Source Title: URL
+""" + _CITATION_RULES + """
+""" + _CITATION_EXAMPLE + """
 </Citation Rules>
 
 Critical Reminder: It is extremely important that any information that is even remotely relevant to the user's research topic is preserved verbatim (e.g. don't rewrite it, don't summarize it, don't paraphrase it).
-"""
+
+""" + _DATE_LINE + "\n"
 
 compress_research_human_message = """All above messages are about research conducted by an AI Researcher for the following research topic:
 
@@ -410,22 +519,12 @@ CRITICAL REQUIREMENTS:
 
 The cleaned findings will be used for final report generation, so comprehensiveness is critical."""
 
-final_report_generation_prompt = """Based on all the research conducted, create a comprehensive, well-structured answer to the overall research brief:
-<Research Brief>
-{research_brief}
-</Research Brief>
+final_report_generation_prompt = """Based on all the research conducted, create a comprehensive, well-structured answer to the overall research brief given at the end of this message.
 
 CRITICAL: Make sure the answer is written in the same language as the human messages!
 For example, if the user's messages are in English, then MAKE SURE you write your response in English. If the user's messages are in Chinese, then MAKE SURE you write your entire response in Chinese.
 This is critical. The user will only understand the answer if it is written in the same language as their input message.
 
-Today's date is {date}.
-
-Here are the findings from the research that you conducted:
-<Findings>
-{findings}
-</Findings>
-
 Please create a detailed answer to the overall research brief that:
 1. Is well-organized with proper headings (# for title, ## for sections, ### for subsections)
 2. Includes specific facts and insights from the research
@@ -477,15 +576,22 @@ Make sure the final answer report is in the SAME language as the human messages
 Format the report in clear markdown with proper structure and include source references where appropriate.
 
 <Citation Rules>
-- Assign each unique URL a single citation number in your text
-- End with ### Sources that lists each source with corresponding numbers
-- IMPORTANT: Number sources sequentially without gaps (1,2,3,4...) in the final list regardless of which sources you choose
+""" + _CITATION_RULES + """
 - Each source should be a separate line item in a list, so that in markdown it is rendered as a list.
-- Example format:
-  [1] Source Title: URL
-  [2] Source Title: URL
+""" + _CITATION_EXAMPLE + """
 - Citations are extremely important. Make sure to include these, and pay a lot of attention to getting these right. Users will often use these citations to look into more information.
 </Citation Rules>
+
+Today's date is {date}.
+
+<Research Brief>
+{research_brief}
+</Research Brief>
+
+Here are the findings from the research that you conducted:
+<Findings>
+{findings}
+</Findings>
 """
 
 BRIEF_CRITERIA_PROMPT = """
@@ -615,3 +721,70 @@ Judgment: FAIL - assumes "modern", "safe", and "good schools" preferences
 <output_instructions>
 Carefully scan the brief for any details not explicitly provided by the user. Be strict - when in doubt about whether something was user-specified, lean toward FAIL.
 </output_instructions>"""
+
+# ===== RENDERERS =====
+
+# Renderers are compiled lazily on first access (PEP 562), so importing this
+# module only pays for the templates a given workflow actually uses.
+_RENDERER_TEMPLATES = {
+    "render_clarify_with_user": clarify_with_user_instructions,
+    "render_research_brief": _transform_messages_into_research_topic_template,
+    "render_research_agent": research_agent_prompt,
+    "render_summarize_webpage": _summarize_webpage_template,
+    "render_research_agent_with_mcp": research_agent_prompt_with_mcp,
+    "render_lead_researcher": lead_researcher_prompt,
+    "render_compress_research_system": compress_research_system_prompt,
+    "render_compress_research_human": compress_research_human_message,
+    "render_final_report": final_report_generation_prompt,
+}
+
+# Renderers whose arguments are only dates and limits, so the same rendered
+# prompt recurs on every supervisor/researcher turn of a run
+_CACHED_RENDERERS = {
+    "render_research_agent",
+    "render_research_agent_with_mcp",
+    "render_lead_researcher",
+    "render_compress_research_system",
+}
+
+# Template fields filled from files in prompts_data/ when the renderer is compiled
+_RENDERER_DATA_FILES = {
+    "render_research_brief": {"example": "watsonx_brief.txt"},
+    "render_summarize_webpage": {"output_format": "summary_format.json"},
+}
+
+# Exported templates with data fields, mapped to the renderer sharing their template.
+# They are built on first access with the data filled in (braces escaped), so they
+# remain complete ``str.format`` templates over the remaining fields.
+_DATA_FILLED_TEMPLATES = {
+    "transform_messages_into_research_topic_prompt": "render_research_brief",
+    "summarize_webpage_prompt": "render_summarize_webpage",
+}
+
+def _fill_data_fields(renderer_name: str) -> str:
+    """Return a renderer's template with its prompts_data/ fields substituted."""
+    template = _RENDERER_TEMPLATES[renderer_name]
+    for field, filename in _RENDERER_DATA_FILES[renderer_name].items():
+        data = _load_prompt_data(filename).replace("{", "{{").replace("}", "}}")
+        template = template.replace(f"{{{field}}}", data)
+    return template
+
+def __getattr__(name: str) -> PromptTemplate | str:
+    """Build a ``render_*`` template or data-filled prompt on first access and cache it."""
+    if name in _DATA_FILLED_TEMPLATES:
+        prompt = globals()[name] = _fill_data_fields(_DATA_FILLED_TEMPLATES[name])
+        return prompt
+    try:
+        template = _RENDERER_TEMPLATES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    bound = {
+        field: _load_prompt_data(filename)
+        for field, filename in _RENDERER_DATA_FILES.get(name, {}).items()
+    }
+    renderer = globals()[name] = PromptTemplate(name, template, bound, cache=name in _CACHED_RENDERERS)
+    return renderer
+
+def __dir__() -> list[str]:
+    """List module attributes including the lazily built renderers and prompts."""
+    return sorted(set(globals()) | set(_RENDERER_TEMPLATES) | set(_DATA_FILLED_TEMPLATES))
@@ -14,7 +14,7 @@ from langchain.chat_models import init_chat_model
 
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
 from deep_research_from_scratch.utils import tavily_search, tavily_extract, tavily_map, get_today_str, think_tool
-from deep_research_from_scratch.prompts import research_agent_prompt, compress_research_system_prompt, compress_research_human_message
+from deep_research_from_scratch.prompts import render_research_agent, render_compress_research_system, render_compress_research_human
 
 # ===== CONFIGURATION =====
 
@@ -42,7 +42,7 @@ def llm_call(state: ResearcherState):
     return {
         "researcher_messages": [
             model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)] + state["researcher_messages"]
+                [SystemMessage(content=render_research_agent(date=get_today_str()))] + state["researcher_messages"]
             )
         ]
     }
@@ -79,8 +79,8 @@ def compress_research(state: ResearcherState) -> dict:
     a compressed summary suitable for the supervisor's decision-making.
     """
 
-    system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
+    system_message = render_compress_research_system(date=get_today_str())
+    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=render_compress_research_human(research_topic=state.get("research_topic", "")))]
     response = compress_model.invoke(messages)
 
     # Extract raw notes from tool and AI messages
@@ -16,9 +16,9 @@ from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, START, END
 
 from deep_research_from_scratch.utils import get_today_str
-from deep_research_from_scratch.prompts import final_report_generation_prompt
+from deep_research_from_scratch.prompts import render_final_report
 from deep_research_from_scratch.state_scope import AgentState, AgentInputState
-from deep_research_from_scratch.research_agent_scope import clarify_with_user, write_research_brief
+from deep_research_from_scratch.research_agent_scope import init_run, clarify_with_user, write_research_brief
 from deep_research_from_scratch.multi_agent_supervisor import supervisor_agent
 
 # ===== Config =====
@@ -41,10 +41,10 @@ async def final_report_generation(state: AgentState):
 
     findings = "\n".join(notes)
 
-    final_report_prompt = final_report_generation_prompt.format(
+    final_report_prompt = render_final_report(
         research_brief=state.get("research_brief", ""),
         findings=findings,
-        date=get_today_str()
+        date=state.get("today") or get_today_str()
     )
 
     final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
@@ -59,13 +59,15 @@ async def final_report_generation(state: AgentState):
 deep_researcher_builder = StateGraph(AgentState, input_schema=AgentInputState)
 
 # Add workflow nodes
+deep_researcher_builder.add_node("init_run", init_run)
 deep_researcher_builder.add_node("clarify_with_user", clarify_with_user)
 deep_researcher_builder.add_node("write_research_brief", write_research_brief)
 deep_researcher_builder.add_node("supervisor_subgraph", supervisor_agent)
 deep_researcher_builder.add_node("final_report_generation", final_report_generation)
 
 # Add workflow edges
-deep_researcher_builder.add_edge(START, "clarify_with_user")
+deep_researcher_builder.add_edge(START, "init_run")
+deep_researcher_builder.add_edge("init_run", "clarify_with_user")
 deep_researcher_builder.add_edge("write_research_brief", "supervisor_subgraph")
 deep_researcher_builder.add_edge("supervisor_subgraph", "final_report_generation")
 deep_researcher_builder.add_edge("final_report_generation", END)
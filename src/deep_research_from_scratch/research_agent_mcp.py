@@ -23,7 +23,7 @@ from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, fi
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.graph import StateGraph, START, END
 
-from deep_research_from_scratch.prompts import research_agent_prompt_with_mcp, compress_research_system_prompt, compress_research_human_message
+from deep_research_from_scratch.prompts import render_research_agent_with_mcp, render_compress_research_system, render_compress_research_human
 from deep_research_from_scratch.state_research import ResearcherState, ResearcherOutputState
 from deep_research_from_scratch.utils import get_today_str, think_tool, get_current_dir
 
@@ -82,7 +82,7 @@ async def llm_call(state: ResearcherState):
     return {
         "researcher_messages": [
             model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt_with_mcp.format(date=get_today_str()))] + state["researcher_messages"]
+                [SystemMessage(content=render_research_agent_with_mcp(date=get_today_str()))] + state["researcher_messages"]
             )
         ]
     }
@@ -146,8 +146,8 @@ def compress_research(state: ResearcherState) -> dict:
     file-based research content from MCP tools.
     """
 
-    system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
+    system_message = render_compress_research_system(date=get_today_str())
+    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=render_compress_research_human(research_topic=state.get("research_topic", "")))]
 
     response = compress_model.invoke(messages)
 
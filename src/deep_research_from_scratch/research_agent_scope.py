@@ -8,8 +8,14 @@ This module implements the scoping phase of the research workflow, where we:
 The workflow uses structured output to make deterministic decisions about
 whether sufficient context exists to proceed with research.
 """
+import asyncio
+import functools
+import hashlib
+import os
 import re
+import tempfile
 from datetime import datetime
+from pathlib import Path
 from typing_extensions import Literal
 
 from langchain.chat_models import init_chat_model
@@ -17,41 +23,125 @@ from langchain_core.messages import HumanMessage, AIMessage, get_buffer_string
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from deep_research_from_scratch.prompts import clarify_with_user_instructions, transform_messages_into_research_topic_prompt
+from deep_research_from_scratch.prompts import render_clarify_with_user, render_research_brief
 from deep_research_from_scratch.state_scope import AgentState, ClarifyWithUser, ResearchQuestion, AgentInputState
 
 # ===== UTILITY FUNCTIONS =====
 
 def get_today_str() -> str:
     """Get current date in a human-readable format."""
-    return datetime.now().strftime("%a %b %-d, %Y")
+    # Strip the day's zero padding by hand: %-d is glibc-only and fails on Windows
+    return datetime.now().strftime("%a %b %d, %Y").replace(" 0", " ")
 
 # ===== CONFIGURATION =====
 
 # Initialize model
-model = init_chat_model(model="openai:gpt-4.1", temperature=0.0)
+MODEL_NAME = "openai:gpt-4.1"
+MODEL_TEMPERATURE = 0.0
+model = init_chat_model(model=MODEL_NAME, temperature=MODEL_TEMPERATURE)
+
+# One structured-output binding per scoping schema, shared by every node call
+_CLARIFY_LLM = model.with_structured_output(ClarifyWithUser)
+_BRIEF_LLM = model.with_structured_output(ResearchQuestion)
+_STRUCTURED_LLMS = {ClarifyWithUser: _CLARIFY_LLM, ResearchQuestion: _BRIEF_LLM}
+
+# Structured scoping responses are memoized here, keyed on model + prompt
+SCOPE_CACHE_DIR = Path(".cache") / "scope"
+
+# Collapses internal whitespace runs in success criteria bullets
+_WS_RE = re.compile(r"\s+")
+
+# ===== CACHING =====
+
+def _scope_cache_path(schema, prompt: str) -> Path:
+    """Return the on-disk cache file for a structured scoping call."""
+    key = hashlib.sha256(f"{MODEL_NAME}\0{schema.__name__}\0{prompt}".encode()).hexdigest()
+    return SCOPE_CACHE_DIR / f"{key}.json"
+
+def _load_cached(schema, path: Path):
+    """Return the cached response at ``path``, or None if there is no usable entry."""
+    try:
+        return schema.model_validate_json(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # Missing, unreadable or stale entry (schema changed): fall through to the model
+        return None
+
+def _store_cached(path: Path, response) -> None:
+    """Write ``response`` to ``path`` atomically, ignoring filesystem errors."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file per writer: concurrent stores of one key must not share it
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(response.model_dump_json())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+
+async def ainvoke_structured_cached(schema, prompt: str):
+    """Invoke the scoping model with structured output, memoized on disk.
+
+    Identical prompts (the same conversation on the same day) reuse the stored
+    response instead of calling the API again. The cache is bypassed when the
+    model samples with a non-zero temperature, since responses are then not
+    reproducible.
+
+    Args:
+        schema: Structured output schema (ClarifyWithUser or ResearchQuestion)
+        prompt: Fully rendered prompt text
+
+    Returns:
+        Parsed instance of ``schema``
+    """
+    structured_output_model = _STRUCTURED_LLMS[schema]
+    if MODEL_TEMPERATURE > 0:
+        return await structured_output_model.ainvoke([HumanMessage(content=prompt)])
+
+    # Cache file IO runs in a worker thread so it never blocks the event loop
+    path = _scope_cache_path(schema, prompt)
+    response = await asyncio.to_thread(_load_cached, schema, path)
+    if response is None:
+        response = await structured_output_model.ainvoke([HumanMessage(content=prompt)])
+        await asyncio.to_thread(_store_cached, path, response)
+    return response
 
 # ===== WORKFLOW NODES =====
 
-def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brief", "__end__"]]:
+def init_run(state: AgentState):
+    """Stamp the run with today's date so every node formats the same value."""
+    return {"today": get_today_str()}
+
+async def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brief", "__end__"]]:
     """
     Determine if the user's request contains sufficient information to proceed with research.
 
     Uses structured output to make deterministic decisions and avoid hallucination.
     Routes to either research brief generation or ends with a clarification question.
+
+    Most requests need no clarification, so the research brief is drafted
+    speculatively alongside the decision and handed to write_research_brief,
+    saving a second sequential model round trip.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ClarifyWithUser)
-
-    # Invoke the model with clarification instructions
-    response = structured_output_model.invoke([
-        HumanMessage(content=clarify_with_user_instructions.format(
-            messages=get_buffer_string(messages=state["messages"]), 
-            date=get_today_str()
-        ))
-    ])
-
-    # Route based on clarification need
+    messages = get_buffer_string(messages=state["messages"])
+    date = state.get("today") or get_today_str()
+
+    # Invoke the clarification check and the brief draft concurrently
+    response, brief_response = await asyncio.gather(
+        ainvoke_structured_cached(
+            ClarifyWithUser,
+            render_clarify_with_user(messages=messages, date=date),
+        ),
+        ainvoke_structured_cached(
+            ResearchQuestion,
+            render_research_brief(messages=messages, date=date),
+        ),
+    )
+
+    # Route based on clarification need (the speculative brief is discarded)
     if response.need_clarification:
         return Command(
             goto=END, 
@@ -60,74 +150,116 @@ def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brie
     else:
         return Command(
             goto="write_research_brief", 
-            update={"messages": [AIMessage(content=response.verification)]}
+            update={
+                "messages": [AIMessage(content=response.verification)],
+                "research_brief": brief_response.research_brief,
+            }
         )
 
-def write_research_brief(state: AgentState):
+async def write_research_brief(state: AgentState):
     """
     Transform the conversation history into a comprehensive research brief.
 
     Uses structured output to ensure the brief follows the required format
     and contains all necessary details for effective research.
     """
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(ResearchQuestion)
-
-    # Generate research brief from conversation history
-    response = structured_output_model.invoke([
-        HumanMessage(content=transform_messages_into_research_topic_prompt.format(
-            messages=get_buffer_string(state.get("messages", [])),
-            date=get_today_str()
-        ))
-    ])
+    # clarify_with_user already drafted the brief on the no-clarification path
+    research_brief = state.get("research_brief")
+    if not research_brief:
+        # Generate research brief from conversation history
+        response = await ainvoke_structured_cached(
+            ResearchQuestion,
+            render_research_brief(
+                messages=get_buffer_string(state.get("messages", [])),
+                date=state.get("today") or get_today_str()
+            ),
+        )
+        research_brief = response.research_brief
 
     # Convert criteria list → dict with all False initially (not yet evaluated)
     # success_criteria_dict = {criterion: False for criterion in response.success_criteria}
 
     return {
-        "research_brief": response.research_brief,
+        "research_brief": research_brief,
         # "success_criteria": success_criteria_dict,
-        "supervisor_messages": [HumanMessage(content=f"{response.research_brief}.")]
+        "supervisor_messages": [HumanMessage(content=f"{research_brief}.")]
     }
 
+@functools.lru_cache(maxsize=32)
+def _extract_success_criteria(brief: str) -> tuple[str, ...]:
+    """Return the bullet criteria listed under the brief's "Success Criteria" header."""
+    criteria = {}
+
+    # --- Single pass: skip to the "Success Criteria" header, then collect bullets ---
+    in_section = False
+    for line in brief.splitlines():
+        if not in_section:
+            in_section = "success criteria" in line.lower()
+            continue
+        # Capture each bullet (• or -) line as an individual criterion
+        stripped = line.lstrip()
+        if stripped[:1] in ("•", "-"):
+            clean_line = stripped[1:].strip()
+            # Most bullets are already single-spaced; only run the regex on messy ones
+            # (non-ASCII text may hide Unicode whitespace such as NBSP)
+            if "  " in clean_line or "\t" in clean_line or not clean_line.isascii():
+                clean_line = _WS_RE.sub(" ", clean_line)
+            if clean_line:
+                criteria[clean_line] = None
+
+    return tuple(criteria)
+
 def parse_success_criteria(state: AgentState):
     """
     Extracts success criteria from the research brief and updates the AgentState
     with a dictionary mapping each criterion to False (not yet evaluated).
     """
-    brief = state.get("research_brief", "")
-    criteria_dict = {}
+    brief = state.get("research_brief") or ""
 
-    if not brief:
+    # Cheap substring test covers both empty briefs and briefs without the section
+    if "success criteria" not in brief.lower():
         return {"success_criteria": {}}
 
-    # --- Extract text after "Success Criteria" section ---
-    match = re.search(r"Success Criteria(.*)", brief, flags=re.IGNORECASE | re.DOTALL)
-    if match:
-        section_text = match.group(1).strip()
-        # Capture each bullet (• or -) line as an individual criterion
-        lines = re.findall(r"[•\-]\s*(.+)", section_text)
-        for line in lines:
-            clean_line = re.sub(r"\s+", " ", line).strip()
-            if clean_line:
-                criteria_dict[clean_line] = False
-
-    return {"success_criteria": criteria_dict}
+    return {"success_criteria": dict.fromkeys(_extract_success_criteria(brief), False)}
 
 # ===== GRAPH CONSTRUCTION =====
 
-deep_researcher_builder = StateGraph(AgentState, input_schema=AgentInputState)
+def build_scope_builder() -> StateGraph:
+    """Assemble the uncompiled scoping workflow.
+
+    Graph construction is deferred to this factory so that modules which only
+    reuse the scoping nodes (e.g. tavily_deep_research_agent) don't pay for a
+    second graph at import time.
+    """
+    scope_builder = StateGraph(AgentState, input_schema=AgentInputState)
+
+    # Add workflow nodes
+    scope_builder.add_node("init_run", init_run)
+    scope_builder.add_node("clarify_with_user", clarify_with_user)
+    scope_builder.add_node("write_research_brief", write_research_brief)
+    scope_builder.add_node("parse_success_criteria", parse_success_criteria)
+
+    # Add workflow edges (clarify_with_user routes itself via Command)
+    scope_builder.add_edge(START, "init_run")
+    scope_builder.add_edge("init_run", "clarify_with_user")
+    scope_builder.add_edge("write_research_brief", "parse_success_criteria")
+    scope_builder.add_edge("parse_success_criteria", END)
+
+    return scope_builder
 
-# Add workflow nodes
-deep_researcher_builder.add_node("clarify_with_user", clarify_with_user)
-deep_researcher_builder.add_node("write_research_brief", write_research_brief)
-deep_researcher_builder.add_node("parse_success_criteria", parse_success_criteria)  # ✅ new node
+def build_scope_graph():
+    """Build and compile the standalone scoping workflow."""
+    return build_scope_builder().compile()
 
-# Add workflow edges
-deep_researcher_builder.add_edge(START, "clarify_with_user")
-deep_researcher_builder.add_edge("clarify_with_user", "write_research_brief")
-deep_researcher_builder.add_edge("write_research_brief", "parse_success_criteria")  # ✅ link new node
-deep_researcher_builder.add_edge("parse_success_criteria", END)
+# Built on first access by __getattr__ below
+_LAZY_ATTRS = {
+    "deep_researcher_builder": build_scope_builder,  # compiled with a checkpointer in the notebooks
+    "scope_research": build_scope_graph,  # referenced by langgraph.json
+}
 
-# Compile the workflow
-scope_research = deep_researcher_builder.compile()
+def __getattr__(name: str):
+    """Build ``deep_researcher_builder`` / ``scope_research`` on first access."""
+    if name in _LAZY_ATTRS:
+        value = globals()[name] = _LAZY_ATTRS[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,7 +11,7 @@ from typing_extensions import Optional, Annotated, List, Sequence
 from langchain_core.messages import BaseMessage
 from langgraph.graph import MessagesState
 from langgraph.graph.message import add_messages
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict
 
 # ===== STATE DEFINITIONS =====
@@ -29,6 +29,8 @@ class AgentState(MessagesState):
     state management between subgraphs and the main workflow.
     """
 
+    # Human-readable date fixed once at the start of each run
+    today: Optional[str]
     # Research brief generated from user conversation history
     research_brief: Optional[str]
     # Use dictionary for key–value success criteria tracking
@@ -47,6 +49,8 @@ class AgentState(MessagesState):
 class ClarifyWithUser(BaseModel):
     """Schema for user clarification decision and questions."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     need_clarification: bool = Field(
         description="Whether the user needs to be asked a clarifying question.",
     )
@@ -65,6 +69,8 @@ class ResearchQuestion(BaseModel):
     - a list of success criteria defining what constitutes a high-quality outcome.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     research_brief: str = Field(
         description=(
             "A detailed research brief that interprets the user’s intent, "
@@ -12,13 +12,15 @@ The system orchestrates the complete research workflow from initial user
 input through final report delivery.
 """
 
+import hashlib
+
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, START, END
 
 from deep_research_from_scratch.utils import get_today_str
-from deep_research_from_scratch.prompts import final_report_generation_prompt
+from deep_research_from_scratch.prompts import render_final_report
 from deep_research_from_scratch.state_scope import AgentState, AgentInputState
-from deep_research_from_scratch.research_agent_scope import clarify_with_user, write_research_brief, parse_success_criteria
+from deep_research_from_scratch.research_agent_scope import init_run, clarify_with_user, write_research_brief, parse_success_criteria
 from deep_research_from_scratch.multi_agent_supervisor import supervisor_agent
 from deep_research_from_scratch.research_agent import researcher_agent
 
@@ -29,12 +31,33 @@ writer_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model
 
 # ===== FINAL REPORT GENERATION =====
 
+def dedupe_notes(notes: list[str]) -> list[str]:
+    """Drop repeated research notes, keeping the first occurrence of each.
+
+    Notes are compared on whitespace-normalized text, so copies that differ
+    only in spacing or line breaks collapse into one.
+    """
+    seen = set()
+    unique = []
+    for note in notes:
+        digest = hashlib.blake2b(" ".join(note.split()).encode(), digest_size=8).digest()
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(note)
+    return unique
+
 from deep_research_from_scratch.state_scope import AgentState
 
 def run_researcher_agent(state: AgentState):
     """Bridge node that runs the researcher subgraph after scoping."""
 
-    research_topic = state.get("research_brief", "")
+    research_topic = state.get("research_brief") or ""
+
+    # Nothing to research: skip the whole researcher subgraph (LLM + Tavily calls).
+    # Returning no update also avoids re-appending supervisor_messages, an additive channel.
+    if not research_topic.strip():
+        return {}
+
     criteria = state.get("success_criteria", {})
     supervisor_msgs = state.get("supervisor_messages", [])
 
@@ -63,21 +86,27 @@ async def final_report_generation(state: AgentState):
     Synthesizes all research findings into a comprehensive final report
     """
 
-    notes = state.get("raw_notes", [])
-
-    findings = "\n".join(notes)
+    # Researchers often return overlapping notes across tool calls; don't pay for them twice
+    notes = dedupe_notes(state.get("raw_notes", []))
 
-    final_report_prompt = final_report_generation_prompt.format(
+    # Join straight into the render call so no standalone findings copy stays
+    # alive alongside the prompt while the writer model is awaited
+    final_report_prompt = render_final_report(
         research_brief=state.get("research_brief", ""),
-        findings=findings,
-        date=get_today_str()
+        findings="\n".join(notes),
+        date=state.get("today") or get_today_str()
     )
 
-    final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
+    # Stream the report so on_chat_model_stream events reach the UI as tokens arrive
+    pieces = []
+    async for chunk in writer_model.astream([HumanMessage(content=final_report_prompt)]):
+        if isinstance(chunk.content, str):
+            pieces.append(chunk.content)
+    final_report = "".join(pieces)
 
     return {
-        "final_report": final_report.content, 
-        "messages": ["Here is the final report: " + final_report.content],
+        "final_report": final_report, 
+        "messages": ["Here is the final report: " + final_report],
     }
 
 # ===== GRAPH CONSTRUCTION =====
@@ -85,6 +114,7 @@ async def final_report_generation(state: AgentState):
 deep_researcher_builder = StateGraph(AgentState, input_schema=AgentInputState)
 
 # ===== Add workflow nodes =====
+deep_researcher_builder.add_node("init_run", init_run)
 deep_researcher_builder.add_node("clarify_with_user", clarify_with_user)
 deep_researcher_builder.add_node("write_research_brief", write_research_brief)
 deep_researcher_builder.add_node("parse_success_criteria", parse_success_criteria)
@@ -92,7 +122,8 @@ deep_researcher_builder.add_node("run_researcher_agent", run_researcher_agent)
 deep_researcher_builder.add_node("final_report_generation", final_report_generation)
 
 # ===== Connect the edges =====
-deep_researcher_builder.add_edge(START, "clarify_with_user")
+deep_researcher_builder.add_edge(START, "init_run")
+deep_researcher_builder.add_edge("init_run", "clarify_with_user")
 # deep_researcher_builder.add_edge("clarify_with_user", "write_research_brief")
 deep_researcher_builder.add_edge("write_research_brief", "parse_success_criteria")
 deep_researcher_builder.add_edge("parse_success_criteria", "run_researcher_agent")
@@ -16,13 +16,14 @@ from langchain_core.tools import tool, InjectedToolArg
 from tavily import TavilyClient
 
 from deep_research_from_scratch.state_research import Summary
-from deep_research_from_scratch.prompts import summarize_webpage_prompt
+from deep_research_from_scratch.prompts import render_summarize_webpage
 
 # ===== UTILITY FUNCTIONS =====
 
 def get_today_str() -> str:
     """Get current date in a human-readable format."""
-    return datetime.now().strftime("%a %b %-d, %Y")
+    # Strip the day's zero padding by hand: %-d is glibc-only and fails on Windows
+    return datetime.now().strftime("%a %b %d, %Y").replace(" 0", " ")
 
 def get_current_dir() -> Path:
     """Get the current directory of the module.
@@ -40,6 +41,8 @@ def get_current_dir() -> Path:
 # ===== CONFIGURATION =====
 
 summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
+# Built once here rather than per summarize_webpage_content call
+structured_summarization_model = summarization_model.with_structured_output(Summary)
 tavily_client = TavilyClient()
 
 # ===== SEARCH FUNCTIONS =====
@@ -85,12 +88,9 @@ def summarize_webpage_content(webpage_content: str) -> str:
         Formatted summary with key excerpts
     """
     try:
-        # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
-
         # Generate summary
-        summary = structured_model.invoke([
-            HumanMessage(content=summarize_webpage_prompt.format(
+        summary = structured_summarization_model.invoke([
+            HumanMessage(content=render_summarize_webpage(
                 webpage_content=webpage_content, 
                 date=get_today_str()
             ))
@@ -227,7 +227,6 @@ def tavily_extract(
     if not urls:
         return "No URLs provided for extraction."
 
-    structured_model = summarization_model.with_structured_output(Summary)
     formatted_output = "Extraction results:\n\n"
 
     for i, url in enumerate(urls, 1):
@@ -247,8 +246,8 @@ def tavily_extract(
                 formatted_output += f"--- SOURCE {i}: {title} ---\nURL: {url}\nNo content extracted.\n{'-'*80}\n"
                 continue
 
-            summary = structured_model.invoke([
-                HumanMessage(content=summarize_webpage_prompt.format(
+            summary = structured_summarization_model.invoke([
+                HumanMessage(content=render_summarize_webpage(
                     webpage_content=content[:4000],
                     date=get_today_str()
                 ))
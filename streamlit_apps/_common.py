@@ -0,0 +1,50 @@
+"""Shared helpers for the Streamlit research monitor.
+
+Payload-to-text conversion and console rendering used by the app script.
+"""
+
+import json
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+
+
+# ===== UTILITY =====
+def to_text(x: Any) -> str:
+    """Safely convert LangGraph event payloads or message chunks to readable text."""
+    if isinstance(x, str):
+        return x
+    if isinstance(x, BaseMessage):
+        return str(x.content)
+    try:
+        return json.dumps(x, ensure_ascii=False, default=str)
+    except Exception:
+        return str(x)
+
+
+def update_console(console_placeholder, buffer, height=600, streams=None):
+    """Render console buffer, kept scrolled to the newest line.
+
+    ``streams`` holds one chunk list per model response still being streamed
+    (several models can stream at once); each is joined only here, at render
+    time, and shown as a trailing line. The joined text is folded back into its
+    list in place. Buffer and stream entries are HTML-escaped when they are
+    appended, so they are joined as is.
+    """
+    lines = list(buffer)
+    for stream in streams or ():
+        if not stream:
+            continue
+        if len(stream) > 1:
+            # Fold the chunks joined for this frame back into one entry, so the
+            # per-turn list never holds thousands of tiny token strings
+            stream[:] = ["".join(stream)]
+        lines.append("[stream] " + stream[0])
+    # column-reverse pins the scroll position to the bottom in pure CSS; st.markdown
+    # never executes <script> tags, so a JS auto-scroll would only add payload
+    html = (
+        f"<div style='height:{height}px; overflow-y:auto; display:flex; flex-direction:column-reverse;"
+        " border:1px solid #ccc; padding:8px; background-color:#fafafa; font-family:monospace;"
+        f" white-space:pre-wrap;'><div>{'<br>'.join(lines)}</div></div>"
+    )
+    console_placeholder.markdown(html, unsafe_allow_html=True)
@@ -4,27 +4,45 @@ Enhanced Streamlit Monitor for Tavily Deep Research Agent
 
 Streams real-time LangGraph events (nodes and models),
 updates research_brief and success_criteria dynamically in sidebar,
-and retrieves the final_report safely from memory via get_state().
+and captures the final_report from the stream as the writer node finishes.
 """
 
 import asyncio
-import json
 import os, sys
+import time
+import uuid
+from collections import deque
 from html import escape
-from typing import Any
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.checkpoint.memory import InMemorySaver
 
+# Helpers live in a regular module: it is imported once and cached, instead of
+# being re-executed with this script on every Streamlit rerun
+from _common import to_text, update_console
+
 # ===== ENV + PATH SETUP =====
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
-sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+@st.cache_resource
+def load_env() -> bool:
+    """Read the project .env once per process; the environment persists across reruns."""
+    return load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+
+load_env()
+
+# Reruns re-execute this script; only add the src path once so sys.path doesn't grow
+_SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
 
 # ===== AGENT INITIALIZATION =====
-from deep_research_from_scratch.tavily_deep_research_agent import deep_researcher_builder
-checkpointer = InMemorySaver()
-agent = deep_researcher_builder.compile(checkpointer=checkpointer)
+@st.cache_resource
+def get_agent():
+    """Compile the research graph once per process instead of on every script rerun."""
+    from deep_research_from_scratch.tavily_deep_research_agent import (
+        deep_researcher_builder,
+    )
+    return deep_researcher_builder.compile(checkpointer=InMemorySaver())
 
 # ===== STREAMLIT CONFIG =====
 st.set_page_config(page_title="Tavily Deep Research Agent App", layout="centered")
@@ -53,127 +71,258 @@ user_input = st.text_area(
     "Enter a research topic:",
     placeholder="What do you want to research?",
     height=200,
+    key="user_input",
 )
 
-start_btn = st.button("Run Research")
-final_report_box = st.empty()
-
 # ===== SESSION CONTROL =====
 if "is_running" not in st.session_state:
     st.session_state["is_running"] = False
 
+def start_run():
+    """Mark a run as in flight before the rerun, so the button is drawn disabled."""
+    st.session_state["is_running"] = bool(st.session_state["user_input"])
 
-# ===== UTILITY =====
-def to_text(x: Any) -> str:
-    """Safely convert LangGraph event payloads or message chunks to readable text."""
-    if isinstance(x, str):
-        return x
-    try:
-        from langchain_core.messages import BaseMessage
-        if isinstance(x, BaseMessage):
-            return str(getattr(x, "content", x))
-    except Exception:
-        pass
-    try:
-        return json.dumps(x, ensure_ascii=False, default=str)
-    except Exception:
-        return str(x)
-
-
-def update_console(console_placeholder, buffer, height=600):
-    """Render console buffer with auto-scroll."""
-    html = f"""
-    <div id='console' style='height:{height}px; overflow-y:auto; border:1px solid #ccc;
-                padding:8px; background-color:#fafafa; font-family:monospace;
-                white-space:pre-wrap;'>
-        {"<br>".join(buffer[-400:])}
-    </div>
-    <script>
-        var consoleBox = document.getElementById('console');
-        if (consoleBox) {{
-            consoleBox.scrollTop = consoleBox.scrollHeight;
-        }}
-    </script>
+
+# Disabled while a run is in flight so a double click can't start a second full pipeline
+st.button("Run Research", on_click=start_run, disabled=st.session_state["is_running"])
+final_report_box = st.empty()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return this session's event loop, replacing it if it has been closed.
+
+    One loop per browser session is reused across clicks so the model and search
+    clients keep their pooled (TLS-warmed) connections between runs. It is not
+    shared process-wide: two sessions running at once would otherwise both try
+    to drive the same loop.
     """
-    console_placeholder.markdown(html, unsafe_allow_html=True)
+    loop = st.session_state.get("event_loop")
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        st.session_state["event_loop"] = loop
+    # Reruns may land on a different script thread; make the loop current there
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+# ===== RENDER SETTINGS =====
+# Re-render the consoles at most once per interval; intermediate token frames are dropped
+RENDER_INTERVAL_S = 0.05
+# Events that close a step always render immediately, so completions never lag behind
+# (node and graph ends are on_chain_end events, matched in the consumer)
+FORCE_RENDER_EVENTS = frozenset({"on_chat_model_end"})
+# Run types the consoles never show; filtered inside astream_events so they are never dispatched
+EXCLUDED_EVENT_TYPES = ["tool", "prompt", "parser", "retriever"]
+# Console buffers keep only the most recent lines, so memory stays flat on long runs
+CONSOLE_MAX_LINES = 400
+# Most queued events processed back to back before a routine render is allowed
+RENDER_DRAIN_MAX = 50
+
+
+# ===== SIDEBAR RENDERING =====
+def render_brief(brief: str):
+    """Show the research brief in the sidebar."""
+    sidebar_brief.markdown(f"**Research Brief:**\n\n{brief}")
+
+
+def render_criteria(criteria: dict):
+    """Show the success criteria and their completion status in the sidebar."""
+    with sidebar_criteria.container():
+        st.markdown("**Success Criteria:**")
+        st.table({
+            "criterion": list(criteria),
+            "status": ["Complete" if v else "Not Complete" for v in criteria.values()],
+        })
 
 
 # ===== STREAMING FUNCTION =====
 async def run_agent_stream(user_input: str):
-    node_buffer = []
-    model_buffer = []
-    thread_config = {"configurable": {"thread_id": "1", "recursion_limit": 50}}
-
-    async for e in agent.astream_events(
-        {"messages": [HumanMessage(content=user_input)]},
-        stream_mode="events",
-        config=thread_config,
-    ):
-        event = e.get("event")
-        data = e.get("data", {})
-        name = e.get("name", "")
-        meta = e.get("metadata", {})
-        node = meta.get("langgraph_node")
-
-        # ===== NODE EVENTS =====
-        if event == "on_chain_start":
-            node_buffer.append(f"[NODE START] {node or name}")
-        elif event == "on_chain_end":
-            node_buffer.append(f"[NODE END] {node or name}")
-        elif event == "on_graph_end":
-            node_buffer.append("[GRAPH END] Execution complete.")
-
-        # ===== MODEL STREAM =====
-        elif event == "on_chat_model_stream":
-            chunk = to_text(data.get("chunk", ""))
-            if chunk.strip():
-                if model_buffer and model_buffer[-1].startswith("[stream]"):
-                    model_buffer[-1] += chunk
-                else:
-                    model_buffer.append("[stream] " + chunk)
-        elif event == "on_chat_model_end":
-            if model_buffer and model_buffer[-1].startswith("[stream]"):
-                model_buffer[-1] = model_buffer[-1].replace("[stream] ", "")
-            model_buffer.append("[MODEL OUTPUT END]")
-
-        # ===== AGENTSTATE UPDATES =====
-        if event == "on_chain_end":
-            out = data.get("output")
-            if isinstance(out, dict):
-                brief = out.get("research_brief")
-                if brief:
-                    sidebar_brief.markdown(f"**Research Brief:**\n\n{escape(str(brief))}")
-
-                criteria = out.get("success_criteria")
-                if isinstance(criteria, dict) and criteria:
-                    formatted = "<br>".join(
-                        [f"- {escape(k)}: {'Complete' if v else 'Not Complete'}"
-                         for k, v in criteria.items()]
-                    )
-                    sidebar_criteria.markdown(
-                        f"**Success Criteria:**<br>{formatted}",
-                        unsafe_allow_html=True,
-                    )
-
-        # ===== RENDER LIVE =====
-        update_console(node_console, node_buffer)
-        update_console(model_console, model_buffer)
-
-    # ===== RETRIEVE FINAL STATE SAFELY =====
-    final_state = agent.get_state(thread_config["configurable"])
-
+    # Resolved on first run, so page loads and widget reruns never import the agent package
+    agent = get_agent()
+    node_buffer = deque(maxlen=CONSOLE_MAX_LINES)
+    model_buffer = deque(maxlen=CONSOLE_MAX_LINES)
+    # Kept so the closing rerun (which re-enables the button) can redraw the results.
+    # The buffers are stored up front, so the consoles survive a failed run too.
+    last_run = st.session_state["last_run"] = {
+        "node_lines": node_buffer,
+        "model_lines": model_buffer,
+        "report": "",
+        "reply": "",
+        "brief": None,
+        "criteria": None,
+    }
+    # Chunks of each model response currently streaming, keyed by run_id so concurrent
+    # calls (e.g. clarify + speculative brief) don't interleave; joined once when it ends
+    current_streams: dict[str, list[str]] = {}
     report = ""
-    if isinstance(final_state, dict):
-        report = final_state.get("final_report", "")
+    # Tokens of the final report as the writer node streams them
+    report_stream: list[str] = []
+    last_brief = None
+    last_criteria = None
+    brief_dirty = criteria_dirty = False
+    last_render = 0.0
+    # Fresh thread per run: the cached checkpointer outlives reruns, and reusing one
+    # thread would accumulate raw_notes and messages from earlier queries
+    thread_config = {"configurable": {"thread_id": str(uuid.uuid4()), "recursion_limit": 50}}
+
+    # Network reads and rendering are decoupled: the producer only enqueues events,
+    # and the consumer drains bursts without yielding before paying for one render
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for e in agent.astream_events(
+                {"messages": [HumanMessage(content=user_input)]},
+                version="v2",
+                config=thread_config,
+                exclude_types=EXCLUDED_EVENT_TYPES,
+            ):
+                queue.put_nowait(e)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    drained = 0
+    try:
+        while (e := await queue.get()) is not None:
+            event = e.get("event")
+            data = e.get("data", {})
+            name = e.get("name", "")
+            meta = e.get("metadata", {})
+            node = meta.get("langgraph_node")
+            # astream_events v2 has no graph-level event: the root graph ends as an
+            # on_chain_end ("LangGraph") with no parent run and no langgraph_node
+            graph_end = event == "on_chain_end" and not e.get("parent_ids")
+
+            # ===== NODE EVENTS =====
+            if graph_end:
+                node_buffer.append("[GRAPH END] Execution complete.")
+            elif event in ("on_chain_start", "on_chain_end"):
+                # Inner runnables also carry their enclosing node's langgraph_node;
+                # only the node's own run has a matching name
+                if name == node:
+                    tag = "[NODE START]" if event == "on_chain_start" else "[NODE END]"
+                    node_buffer.append(f"{tag} {escape(node)}")
+
+            # ===== MODEL STREAM =====
+            elif event == "on_chat_model_stream":
+                chunk = to_text(data.get("chunk", ""))
+                if node == "final_report_generation":
+                    # Whitespace is significant in the report's markdown, so keep every chunk
+                    report_stream.append(chunk)
+                # Escaped once on entry (escape is per character, so joined chunks stay valid)
+                current_streams.setdefault(e.get("run_id"), []).append(escape(chunk))
+                if not chunk.strip():
+                    # Kept for spacing fidelity, but nothing visible changed: don't spend a render
+                    continue
+            elif event == "on_chat_model_end":
+                parts = current_streams.pop(e.get("run_id"), None)
+                if parts:
+                    turn_text = "".join(parts)
+                    if turn_text.strip():
+                        model_buffer.append(turn_text)
+                model_buffer.append("[MODEL OUTPUT END]")
+
+            # ===== AGENTSTATE UPDATES =====
+            # Only a node's own chain end carries its state update; inner runnables' ends
+            # (which share the node's langgraph_node) are skipped without probing their output
+            if event == "on_chain_end" and name == node:
+                out = data.get("output")
+                if isinstance(out, dict):
+                    # Capture the report as the writer node finishes instead of re-reading state
+                    if node == "final_report_generation" and out.get("final_report"):
+                        report = out["final_report"]
+
+                    # The same brief/criteria ride along on many chain ends; only stage real
+                    # changes, and let the throttled render step write them to the sidebar
+                    brief = out.get("research_brief")
+                    if brief and brief != last_brief:
+                        last_brief = brief
+                        brief_dirty = True
+
+                    criteria = out.get("success_criteria")
+                    if isinstance(criteria, dict) and criteria and criteria != last_criteria:
+                        last_criteria = dict(criteria)
+                        criteria_dirty = True
+
+            # ===== RENDER LIVE (throttled) =====
+            now = time.monotonic()
+            drained += 1
+            # Node-level chain ends are terminal too; inner runnables' chain ends are not
+            force = event in FORCE_RENDER_EVENTS or graph_end or (event == "on_chain_end" and name == node)
+            # Hold routine frames while a burst is still queued (up to RENDER_DRAIN_MAX events)
+            backlog = not queue.empty() and drained < RENDER_DRAIN_MAX
+            if force or (not backlog and now - last_render >= RENDER_INTERVAL_S):
+                update_console(node_console, node_buffer)
+                update_console(model_console, model_buffer, streams=current_streams.values())
+                if report_stream and not report:
+                    final_report_box.markdown("### Final Report\n\n" + "".join(report_stream))
+                if brief_dirty:
+                    render_brief(last_brief)
+                    brief_dirty = False
+                if criteria_dirty:
+                    render_criteria(last_criteria)
+                    criteria_dirty = False
+                last_render = now
+                drained = 0
+    finally:
+        # Stop reading if rendering failed (or the script was stopped mid-run)
+        if not producer.done():
+            producer.cancel()
+    # Re-raise any error from the stream itself
+    await producer
+
+    # Flush whatever arrived after the last throttled render
+    update_console(node_console, node_buffer)
+    update_console(model_console, model_buffer, streams=current_streams.values())
+    if brief_dirty:
+        render_brief(last_brief)
+    if criteria_dirty:
+        render_criteria(last_criteria)
 
-    final_report_box.markdown(f"### Final Report\n\n{report or '(No final report generated)'}")
+    # ===== FINAL REPORT (captured from the stream) =====
+    reply = ""
+    if not report:
+        # Missed on the stream (e.g. event filtered or renamed): read the checkpoint, never re-run
+        snapshot = await agent.aget_state(thread_config)
+        values = snapshot.values or {}
+        report = values.get("final_report") or ""
+        if not report:
+            # The run stopped early (e.g. to ask a clarifying question): keep the agent's last reply
+            reply = next(
+                (str(m.content) for m in reversed(values.get("messages", [])) if isinstance(m, AIMessage)),
+                "",
+            )
+    last_run.update(report=report, reply=reply, brief=last_brief, criteria=last_criteria)
 
 
 # ===== MAIN ACTION =====
-if start_btn and user_input and not st.session_state["is_running"]:
-    st.session_state["is_running"] = True
+# Set by the button's on_click callback; the button itself is disabled (and reads False) on this run
+if st.session_state["is_running"]:
+    st.session_state.pop("last_run", None)
     st.info("Running agent and streaming events...")
     try:
-        asyncio.run(run_agent_stream(user_input))
+        get_event_loop().run_until_complete(run_agent_stream(user_input))
+    except Exception as exc:
+        # The rerun below would discard the traceback; show it on the next script run
+        st.session_state["run_error"] = exc
     finally:
         st.session_state["is_running"] = False
+        st.rerun()
+else:
+    if "run_error" in st.session_state:
+        st.exception(st.session_state.pop("run_error"))
+    if "last_run" in st.session_state:
+        last_run = st.session_state["last_run"]
+        update_console(node_console, last_run["node_lines"])
+        update_console(model_console, last_run["model_lines"])
+        if last_run["brief"]:
+            render_brief(last_run["brief"])
+        if last_run["criteria"]:
+            render_criteria(last_run["criteria"])
+        if last_run["report"]:
+            final_report_box.markdown(f"### Final Report\n\n{last_run['report']}")
+        elif last_run["reply"]:
+            final_report_box.markdown(f"### Agent Reply\n\n{last_run['reply']}")
+        else:
+            final_report_box.markdown("### Final Report\n\n(No final report generated)")
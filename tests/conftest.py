@@ -0,0 +1,8 @@
+"""Shared test setup."""
+
+import os
+
+# The agent modules build their chat models and search clients at import time,
+# which needs provider keys to be set; no test ever calls a provider.
+for _key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(_key, "test")
@@ -0,0 +1,84 @@
+"""Compiled prompt renderers must match the ``str.format`` templates they replace."""
+
+import string
+
+import pytest
+
+from deep_research_from_scratch import prompts
+from deep_research_from_scratch.prompts import PromptTemplate, _compile, _normalize
+
+
+def _format_fields(template: str) -> set[str]:
+    return {field for _, field, _, _ in string.Formatter().parse(template) if field is not None}
+
+
+def _reference_template(renderer_name: str) -> str:
+    """Return the exported template a renderer stands in for, data fields filled in."""
+    for constant, name in prompts._DATA_FILLED_TEMPLATES.items():
+        if name == renderer_name:
+            return getattr(prompts, constant)
+    return prompts._RENDERER_TEMPLATES[renderer_name]
+
+
+@pytest.mark.parametrize("name", sorted(prompts._RENDERER_TEMPLATES))
+def test_renderer_matches_str_format(name):
+    renderer = getattr(prompts, name)
+    template = _reference_template(name)
+    # Values containing braces must come out verbatim, never be formatted again
+    kwargs = {field: f"<{field} {{x}} }}{{>" for field in renderer.fields}
+    assert set(renderer.fields) == _format_fields(template)
+    assert renderer(**kwargs) == _normalize(template).format(**kwargs)
+
+
+@pytest.mark.parametrize("constant", sorted(prompts._DATA_FILLED_TEMPLATES))
+def test_data_filled_prompt_leaves_no_data_fields(constant):
+    renderer_name = prompts._DATA_FILLED_TEMPLATES[constant]
+    fields = _format_fields(getattr(prompts, constant))
+    assert fields.isdisjoint(prompts._RENDERER_DATA_FILES[renderer_name])
+
+
+def test_escaped_braces_are_literal():
+    render, fields = _compile("{{x}} {a} }}{{")
+    assert fields == ("a",)
+    assert render(a="1") == "{{x}} {a} }}{{".format(a="1")
+
+
+def test_repeated_field_is_one_parameter():
+    render, fields = _compile("{a}-{b}-{a}")
+    assert fields == ("a", "b")
+    assert render(a="x", b="y") == "x-y-x"
+
+
+def test_bound_fields_are_inlined():
+    render, fields = _compile("{a} {b} {a}", bound={"b": "{not a field}"})
+    assert fields == ("a",)
+    assert render(a="1") == "1 {not a field} 1"
+
+
+def test_literal_quotes_and_backslashes_survive():
+    template = "it's \"quoted\" \\n {a}\n'''\"\"\""
+    render, _ = _compile(template)
+    assert render(a="v") == template.format(a="v")
+
+
+def test_template_without_fields():
+    render, fields = _compile("no fields {{here}}")
+    assert fields == ()
+    assert render() == "no fields {here}"
+
+
+@pytest.mark.parametrize("template", ["{0}", "{}", "{a!r}", "{a:>4}", "{a.b}", "{a[0]}", "{class}"])
+def test_unsupported_placeholders_are_rejected(template):
+    with pytest.raises(ValueError, match="Unsupported placeholder"):
+        _compile(template)
+
+
+def test_missing_and_unexpected_fields_are_named():
+    template = PromptTemplate("demo", "{a} {b}")
+    with pytest.raises(TypeError, match=r"'demo': missing fields: b; unexpected fields: c"):
+        template(a="1", c="2")
+
+
+def test_cached_template_renders_like_uncached():
+    cached = PromptTemplate("demo", "{a}\n\n\n\n{b}  ", cache=True)
+    assert cached(a="1", b="2") == cached(a="1", b="2") == "1\n\n2"
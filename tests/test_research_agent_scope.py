@@ -0,0 +1,55 @@
+"""Success-criteria parsing of the research brief."""
+
+from deep_research_from_scratch.research_agent_scope import (
+    _extract_success_criteria,
+    parse_success_criteria,
+)
+
+BRIEF = """\
+Research the market for home batteries - focus on Europe.
+
+Success Criteria:
+- Covers the three largest vendors
+  • Compares   price per kWh
+-\tIncludes 2024 data
+- Covers the three largest vendors
+-
+Not a bullet - even with a hyphen
+"""
+
+
+def test_collects_bullets_after_the_header_only():
+    assert _extract_success_criteria(BRIEF) == (
+        "Covers the three largest vendors",
+        "Compares price per kWh",
+        "Includes 2024 data",
+    )
+
+
+def test_header_match_is_case_insensitive():
+    assert _extract_success_criteria("SUCCESS CRITERIA\n- one\n- two") == ("one", "two")
+
+
+def test_unicode_whitespace_is_collapsed():
+    assert _extract_success_criteria("Success criteria\n- a\u00a0\u00a0b\u2003c") == ("a b c",)
+
+
+def test_no_header_means_no_criteria():
+    assert _extract_success_criteria("- looks like a bullet\n- another") == ()
+
+
+def test_parse_success_criteria_marks_every_criterion_incomplete():
+    update = parse_success_criteria({"research_brief": BRIEF})
+    assert update == {
+        "success_criteria": {
+            "Covers the three largest vendors": False,
+            "Compares price per kWh": False,
+            "Includes 2024 data": False,
+        }
+    }
+
+
+def test_parse_success_criteria_without_brief():
+    assert parse_success_criteria({}) == {"success_criteria": {}}
+    assert parse_success_criteria({"research_brief": None}) == {"success_criteria": {}}
+    assert parse_success_criteria({"research_brief": "No criteria here."}) == {"success_criteria": {}}
@@ -0,0 +1,21 @@
+"""Note deduplication before the final report."""
+
+from deep_research_from_scratch.tavily_deep_research_agent import dedupe_notes
+
+
+def test_keeps_first_occurrence_in_order():
+    assert dedupe_notes(["b", "a", "b", "c", "a"]) == ["b", "a", "c"]
+
+
+def test_whitespace_only_differences_collapse():
+    notes = ["Battery prices fell\nin 2024.", "  Battery  prices fell in\t2024. ", "Battery prices rose in 2024."]
+    assert dedupe_notes(notes) == [notes[0], notes[2]]
+
+
+def test_distinct_notes_are_all_kept():
+    notes = [f"note {i}" for i in range(100)]
+    assert dedupe_notes(notes) == notes
+
+
+def test_empty_input():
+    assert dedupe_notes([]) == []